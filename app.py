@@ -1,15 +1,24 @@
+import csv
 import io
 import json
+import re
 import zipfile
+from contextlib import ExitStack
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import cpu_count
 from pathlib import Path
-from typing import Any, cast
+from typing import Any, Callable, cast
 
+import numpy as np
+import orjson
 import pandas as pd
+import pyarrow as pa
+import simplejpeg
 import streamlit as st
 import pymupdf
 from PIL import Image
 
-
 TABULAR_TARGETS = {
     "csv": ["json", "xlsx", "tsv"],
     "tsv": ["csv", "json", "xlsx"],
@@ -34,21 +43,95 @@ PDF_TARGETS = {
     "pdf": ["png", "jpg", "webp", "bmp"],
 }
 
+ALL_TARGETS = {**TABULAR_TARGETS, **TEXT_TARGETS, **IMAGE_TARGETS, **PDF_TARGETS}
+
+MIME_TYPES = {
+    "csv": "text/csv",
+    "tsv": "text/tab-separated-values",
+    "json": "application/json",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "txt": "text/plain",
+    "md": "text/markdown",
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "webp": "image/webp",
+    "bmp": "image/bmp",
+}
+
+JPEG_QUALITY = 90
+
+PRECOMPRESSED_FORMATS = {"jpg", "png", "webp"}
+
+FAST_JPEG_MIN_DPI = 200
+
+ALL_PAGES_FAILED_MESSAGE = (
+    "全ページの変換に失敗しました。PDFの内容や設定を確認してください。"
+)
+
 
 def detect_extension(filename: str) -> str:
     return Path(filename).suffix.lower().lstrip(".")
 
 
+def is_same_format(source_ext: str, target_ext: str) -> bool:
+    aliases = {"jpeg": "jpg"}
+    return aliases.get(source_ext, source_ext) == aliases.get(target_ext, target_ext)
+
+
 def get_candidates(ext: str) -> list[str]:
-    if ext in TABULAR_TARGETS:
-        return TABULAR_TARGETS[ext]
-    if ext in TEXT_TARGETS:
-        return TEXT_TARGETS[ext]
-    if ext in IMAGE_TARGETS:
-        return IMAGE_TARGETS[ext]
-    if ext in PDF_TARGETS:
-        return PDF_TARGETS[ext]
-    return []
+    return ALL_TARGETS.get(ext, [])
+
+
+# 20桁以上の数字列。2^64 を超える整数は orjson だと黙って float になる
+_LONG_DIGITS = re.compile(rb"\d{20,}")
+
+
+def _loads_json(raw: bytes) -> Any:
+    # orjson は NaN を受け付けず、64ビットを超える整数を float にしてしまうため、
+    # その場合は標準の json で読む
+    if _LONG_DIGITS.search(raw) is None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw)
+
+
+def _normalize_records(data: Any) -> pd.DataFrame:
+    df = pd.json_normalize(data)
+    try:
+        return df.convert_dtypes(dtype_backend="pyarrow")
+    except (OverflowError, pa.ArrowInvalid):
+        # int64 に収まらない整数を含む列は Arrow に変換できないため、そのまま使う
+        return df
+
+
+def _records_to_frame(data: Any) -> pd.DataFrame:
+    # 全レコードのキーから型を推論し、ネストは json_normalize と同じ "a.b" 列に展開する
+    try:
+        records = pa.array(data, from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError):
+        return _normalize_records(data)
+    if not pa.types.is_struct(records.type):
+        return _normalize_records(data)
+
+    table = pa.Table.from_struct_array(records)
+    while any(pa.types.is_struct(field.type) for field in table.schema):
+        table = table.flatten()
+    if any(pa.types.is_nested(field.type) for field in table.schema):
+        return _normalize_records(data)
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def _json_default(obj: Any) -> Any:
+    if obj is pd.NA or obj is pd.NaT:
+        return None
+    if isinstance(obj, (pd.Timestamp, pd.Timedelta)):
+        return obj.isoformat()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError
 
 
 def load_tabular(source_ext: str, raw: bytes) -> pd.DataFrame:
@@ -58,168 +141,386 @@ def load_tabular(source_ext: str, raw: bytes) -> pd.DataFrame:
     if source_ext == "tsv":
         return pd.read_csv(bio, sep="\t")
     if source_ext == "json":
-        data = json.loads(raw.decode("utf-8"))
+        data = _loads_json(raw)
         if isinstance(data, dict):
             data = [data]
-        return pd.json_normalize(data)
+        return _records_to_frame(data)
     if source_ext == "xlsx":
-        return pd.read_excel(bio)
+        return pd.read_excel(bio, engine="calamine")
     raise ValueError("未対応の表形式ファイルです")
 
 
+DELIMITERS = {"csv": ",", "tsv": "\t"}
+
+
+def convert_delimited(
+    source_ext: str, target_ext: str, raw: bytes
+) -> tuple[bytes, str]:
+    # 区切り文字の付け替えだけなので DataFrame を経由せず行単位で書き出す
+    reader = csv.reader(
+        io.StringIO(raw.decode("utf-8-sig"), newline=""),
+        delimiter=DELIMITERS[source_ext],
+    )
+    out = io.StringIO()
+    writer = csv.writer(out, delimiter=DELIMITERS[target_ext], lineterminator="\n")
+    # pandas と同じく空行は出力しない
+    writer.writerows(row for row in reader if row)
+    return out.getvalue().encode("utf-8"), MIME_TYPES[target_ext]
+
+
 def convert_tabular(source_ext: str, target_ext: str, raw: bytes) -> tuple[bytes, str]:
+    if source_ext in DELIMITERS and target_ext in DELIMITERS:
+        return convert_delimited(source_ext, target_ext, raw)
+
     df = load_tabular(source_ext, raw)
 
     if target_ext == "csv":
         text = df.to_csv(index=False)
-        return text.encode("utf-8"), "text/csv"
+        return text.encode("utf-8"), MIME_TYPES[target_ext]
     if target_ext == "tsv":
         text = df.to_csv(index=False, sep="\t")
-        return text.encode("utf-8"), "text/tab-separated-values"
+        return text.encode("utf-8"), MIME_TYPES[target_ext]
     if target_ext == "json":
-        text = df.to_json(orient="records", force_ascii=False, indent=2)
-        if text is None:
-            raise ValueError("JSONへの変換結果が空でした")
-        return text.encode("utf-8"), "application/json"
+        # to_dict は同名の列を黙って上書きするため、重複があれば変換しない
+        if not df.columns.is_unique:
+            raise ValueError("列名が重複しているためJSONに変換できません")
+        try:
+            encoded = orjson.dumps(
+                df.to_dict(orient="records"),
+                default=_json_default,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+            )
+        except orjson.JSONEncodeError:
+            # 64ビットを超える整数など orjson で書けない値は pandas に任せる
+            text = df.to_json(orient="records", force_ascii=False, indent=2)
+            if text is None:
+                raise ValueError("JSONへの変換結果が空でした")
+            encoded = text.encode("utf-8")
+        return encoded, MIME_TYPES[target_ext]
     if target_ext == "xlsx":
         out = io.BytesIO()
-        with pd.ExcelWriter(cast(Any, out), engine="openpyxl") as writer:
+        with pd.ExcelWriter(cast(Any, out), engine="xlsxwriter") as writer:
             df.to_excel(writer, index=False, sheet_name="Sheet1")
-        return (
-            out.getvalue(),
-            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        )
+        return out.getvalue(), MIME_TYPES[target_ext]
 
     raise ValueError("未対応の変換先です")
 
 
 def convert_text(source_ext: str, target_ext: str, raw: bytes) -> tuple[bytes, str]:
-    text = raw.decode("utf-8")
+    # 内容は変わらないため、UTF-8 として読めることだけ確認して入力をそのまま返す
+    raw.decode("utf-8")
 
     if source_ext == "txt" and target_ext == "md":
-        return text.encode("utf-8"), "text/markdown"
+        return raw, MIME_TYPES[target_ext]
     if source_ext == "md" and target_ext == "txt":
-        return text.encode("utf-8"), "text/plain"
+        return raw, MIME_TYPES[target_ext]
 
     raise ValueError("未対応のテキスト変換です")
 
 
+def _encode_jpeg(arr: np.ndarray, colorspace: str = "RGB") -> bytes:
+    # libjpeg-turbo を直接呼び出し、Pillow のモード変換やメタデータ処理を省く
+    return simplejpeg.encode_jpeg(
+        arr,
+        quality=JPEG_QUALITY,
+        colorspace=colorspace,
+        colorsubsampling="Gray" if colorspace == "GRAY" else "420",
+        fastdct=True,
+    )
+
+
 def convert_image(source_ext: str, target_ext: str, raw: bytes) -> tuple[bytes, str]:
     img = Image.open(io.BytesIO(raw))
-    out = io.BytesIO()
 
-    pil_fmt = "JPEG" if target_ext == "jpg" else target_ext.upper()
-    if pil_fmt == "JPEG" and img.mode in ("RGBA", "P"):
-        img = img.convert("RGB")
-    img.save(out, format=pil_fmt)
+    if target_ext == "jpg":
+        # グレースケールは1チャンネルのまま JPEG にする
+        if img.mode in ("L", "1"):
+            arr = np.ascontiguousarray(img.convert("L"))[:, :, np.newaxis]
+            return _encode_jpeg(arr, colorspace="GRAY"), MIME_TYPES[target_ext]
+        arr = np.ascontiguousarray(img.convert("RGB"))
+        return _encode_jpeg(arr), MIME_TYPES[target_ext]
 
-    mime_map = {
-        "png": "image/png",
-        "jpg": "image/jpeg",
-        "webp": "image/webp",
-        "bmp": "image/bmp",
-    }
-    return out.getvalue(), mime_map[target_ext]
+    out = io.BytesIO()
+    img.save(out, format=target_ext.upper())
+    return out.getvalue(), MIME_TYPES[target_ext]
 
 
+@st.cache_data(show_spinner=False, max_entries=4)
 def get_pdf_page_count(raw: bytes) -> int:
     with pymupdf.open(stream=raw, filetype="pdf") as doc:
         return doc.page_count
 
 
+def _render_doc_page(
+    doc: pymupdf.Document, page_index: int, dpi: int
+) -> tuple[bytes, int, int]:
+    page = doc.load_page(page_index)
+    scale = dpi / 72.0
+    matrix = pymupdf.Matrix(scale, scale)
+    pix = page.get_pixmap(matrix=matrix, alpha=False)
+    return pix.samples, pix.width, pix.height
+
+
+def _render_page(raw: bytes, page_index: int, dpi: int) -> tuple[bytes, int, int]:
+    with pymupdf.open(stream=raw, filetype="pdf") as doc:
+        return _render_doc_page(doc, page_index, dpi)
+
+
+# 300 DPI の A4 ページは RGB で約 26MB になる。全セッション共有のキャッシュなので、
+# 現在のページと前後の先読み分が収まる件数に抑え、一定時間で破棄する
+@st.cache_data(show_spinner=False, max_entries=4, ttl=600)
+def _render_page_cached(
+    raw: bytes,
+    page_index: int,
+    dpi: int,
+    _prefetched: Future[tuple[bytes, int, int]] | None = None,
+) -> tuple[bytes, int, int]:
+    # _prefetched はキャッシュキーに含まれないため、先読み済みの結果をそのまま登録できる
+    if _prefetched is not None:
+        return _prefetched.result()
+    return _render_page(raw, page_index, dpi)
+
+
+def _prefetch_neighbor_pages(
+    file_id: str, raw: bytes, page_index: int, page_count: int, dpi: int
+) -> None:
+    # 先読みは補助的な処理なので、失敗しても画面には出さず変換を続けられるようにする
+    try:
+        _submit_neighbor_pages(file_id, raw, page_index, page_count, dpi)
+    except BrokenProcessPool:
+        # ワーカーが落ちたプールは以後 submit できないため、次回作り直す
+        executor = st.session_state.pop("render_executor", None)
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        st.session_state.pop("render_futures", None)
+        st.session_state.pop("render_file_id", None)
+    except Exception:
+        pass
+
+
+def _submit_neighbor_pages(
+    file_id: str, raw: bytes, page_index: int, page_count: int, dpi: int
+) -> None:
+    # 前後のページを別プロセスで先に描画し、ページを切り替えたときの変換を速くする
+    # PDF はファイルごとにワーカー側で一度だけ開き、タスクにはページ番号と DPI だけを渡す
+    state = st.session_state
+    if state.get("render_file_id") != file_id or "render_executor" not in state:
+        executor = state.pop("render_executor", None)
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        state.render_executor = ProcessPoolExecutor(
+            max_workers=2, initializer=_init_prefetch_worker, initargs=(raw,)
+        )
+        state.render_file_id = file_id
+        state.render_futures = {}
+
+    futures: dict[tuple[int, int], Future[tuple[bytes, int, int]] | None] = (
+        state.render_futures
+    )
+    for key, future in futures.items():
+        if future is not None and future.done():
+            if future.exception() is None:
+                _render_page_cached(raw, *key, _prefetched=future)
+            futures[key] = None
+
+    for neighbor in (page_index - 1, page_index + 1):
+        key = (neighbor, dpi)
+        if 0 <= neighbor < page_count and key not in futures:
+            futures[key] = state.render_executor.submit(_prefetch_page, neighbor, dpi)
+
+
+def _encode_pixmap(pix: pymupdf.Pixmap, target_ext: str) -> bytes:
+    # samples はコピーを返すため、samples_mv でピクセルバッファを直接参照する
+    if target_ext == "jpg":
+        arr = np.frombuffer(pix.samples_mv, np.uint8).reshape(pix.height, pix.width, 3)
+        return _encode_jpeg(arr)
+
+    # PNG は MuPDF 組み込みのエンコーダで直接書き出す。失敗した場合は Pillow を使う
+    if target_ext == "png":
+        try:
+            return pix.tobytes(output="png")
+        except (ValueError, RuntimeError):
+            pass
+
+    image = Image.frombuffer(
+        "RGB", (pix.width, pix.height), pix.samples_mv, "raw", "RGB", pix.stride, 1
+    )
+    out = io.BytesIO()
+    image.save(out, format=target_ext.upper())
+    return out.getvalue()
+
+
+def _shrink_for_jpeg(
+    pix: pymupdf.Pixmap, target_ext: str, dpi: int, fast_jpeg: bool
+) -> None:
+    # JPEG の 4:2:0 では色差が間引かれるため、高 DPI では MuPDF の 2x2 縮小を先にかける
+    if fast_jpeg and target_ext == "jpg" and dpi > FAST_JPEG_MIN_DPI:
+        pix.shrink(1)
+
+
 def convert_pdf(
     target_ext: str,
     raw: bytes,
     page_number: int = 1,
     dpi: int = 200,
+    fast_jpeg: bool = False,
 ) -> tuple[bytes, str]:
-    with pymupdf.open(stream=raw, filetype="pdf") as doc:
-        if doc.page_count == 0:
-            raise ValueError("PDFにページがありません")
+    page_count = get_pdf_page_count(raw)
+    if page_count == 0:
+        raise ValueError("PDFにページがありません")
 
-        page_index = page_number - 1
-        if page_index < 0 or page_index >= doc.page_count:
-            raise ValueError("指定されたページ番号が範囲外です")
+    page_index = page_number - 1
+    if page_index < 0 or page_index >= page_count:
+        raise ValueError("指定されたページ番号が範囲外です")
 
-        page = doc.load_page(page_index)
-        scale = dpi / 72.0
-        matrix = pymupdf.Matrix(scale, scale)
-        pix = page.get_pixmap(matrix=matrix, alpha=False)
+    samples, width, height = _render_page_cached(raw, page_index, dpi)
+    pix = pymupdf.Pixmap(pymupdf.csRGB, width, height, samples, False)
+    _shrink_for_jpeg(pix, target_ext, dpi, fast_jpeg)
+    encoded = _encode_pixmap(pix, target_ext)
+    return encoded, MIME_TYPES[target_ext]
+
+
+_worker_state: dict[str, Any] = {}
+
+
+def _init_prefetch_worker(raw: bytes) -> None:
+    _worker_state["doc"] = pymupdf.open(stream=raw, filetype="pdf")
 
-    image = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
-    out = io.BytesIO()
 
-    pil_fmt = "JPEG" if target_ext == "jpg" else target_ext.upper()
-    image.save(out, format=pil_fmt)
+def _prefetch_page(page_index: int, dpi: int) -> tuple[bytes, int, int]:
+    return _render_doc_page(_worker_state["doc"], page_index, dpi)
 
-    mime_map = {
-        "png": "image/png",
-        "jpg": "image/jpeg",
-        "webp": "image/webp",
-        "bmp": "image/bmp",
+
+def _open_render_state(
+    raw: bytes, dpi: int, target_ext: str, fast_jpeg: bool
+) -> dict[str, Any]:
+    # PDF を1回だけ開き、Matrix も全ページで使い回す
+    scale = dpi / 72.0
+    return {
+        "doc": pymupdf.open(stream=raw, filetype="pdf"),
+        "matrix": pymupdf.Matrix(scale, scale),
+        "dpi": dpi,
+        "target_ext": target_ext,
+        "fast_jpeg": fast_jpeg,
     }
-    return out.getvalue(), mime_map[target_ext]
+
+
+def _init_render_worker(raw: bytes, dpi: int, target_ext: str, fast_jpeg: bool) -> None:
+    _worker_state.update(_open_render_state(raw, dpi, target_ext, fast_jpeg))
+
+
+def _render_with(state: dict[str, Any], page_index: int) -> tuple[int, bytes | None]:
+    try:
+        pix = state["doc"][page_index].get_pixmap(matrix=state["matrix"], alpha=False)
+        _shrink_for_jpeg(pix, state["target_ext"], state["dpi"], state["fast_jpeg"])
+        return page_index, _encode_pixmap(pix, state["target_ext"])
+    except Exception:
+        return page_index, None
+
+
+def _render_one(page_index: int) -> tuple[int, bytes | None]:
+    return _render_with(_worker_state, page_index)
 
 
 def convert_pdf_all_pages(
     target_ext: str,
     raw: bytes,
     dpi: int = 200,
+    fast_jpeg: bool = False,
 ) -> tuple[bytes, str, list[int], int]:
     failed_pages: list[int] = []
     success_count = 0
     zip_buffer = io.BytesIO()
 
-    with pymupdf.open(stream=raw, filetype="pdf") as doc:
-        if doc.page_count == 0:
-            raise ValueError("PDFにページがありません")
-
-        with zipfile.ZipFile(
-            zip_buffer, mode="w", compression=zipfile.ZIP_DEFLATED
-        ) as zf:
-            for page_index in range(doc.page_count):
-                try:
-                    page = doc.load_page(page_index)
-                    scale = dpi / 72.0
-                    matrix = pymupdf.Matrix(scale, scale)
-                    pix = page.get_pixmap(matrix=matrix, alpha=False)
-
-                    image = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
-                    out = io.BytesIO()
-                    pil_fmt = "JPEG" if target_ext == "jpg" else target_ext.upper()
-                    image.save(out, format=pil_fmt)
-
-                    zf.writestr(f"page_{page_index + 1}.{target_ext}", out.getvalue())
-                    success_count += 1
-                except Exception:
+    page_count = get_pdf_page_count(raw)
+    if page_count == 0:
+        raise ValueError("PDFにページがありません")
+
+    # PyMuPDF はスレッドセーフではないため、ページをプロセスに分散する
+    workers = min(cpu_count(), page_count)
+    chunksize = max(1, page_count // (4 * cpu_count()))
+
+    # PNG/JPG/WEBP は圧縮済みなので再圧縮せずに格納する
+    if target_ext in PRECOMPRESSED_FORMATS:
+        compression, compresslevel = zipfile.ZIP_STORED, None
+    else:
+        compression, compresslevel = zipfile.ZIP_DEFLATED, 1
+
+    with ExitStack() as stack:
+        if workers == 1:
+            # 分割先が1つしかない場合はプロセスを起動せず、このプロセスで描画する
+            state = _open_render_state(raw, dpi, target_ext, fast_jpeg)
+            stack.enter_context(state["doc"])
+            results = (_render_with(state, i) for i in range(page_count))
+        else:
+            # ワーカーが異常終了した場合、Pool は待ち続けるが Executor は例外を送出する
+            executor = stack.enter_context(
+                ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_render_worker,
+                    initargs=(raw, dpi, target_ext, fast_jpeg),
+                )
+            )
+            results = executor.map(_render_one, range(page_count), chunksize=chunksize)
+
+        zf = stack.enter_context(
+            zipfile.ZipFile(
+                zip_buffer,
+                mode="w",
+                compression=compression,
+                compresslevel=compresslevel,
+            )
+        )
+        try:
+            for page_index, encoded in results:
+                if encoded is None:
                     failed_pages.append(page_index + 1)
+                    continue
+                zf.writestr(f"page_{page_index + 1}.{target_ext}", encoded)
+                success_count += 1
+        except BrokenProcessPool as e:
+            raise ValueError(ALL_PAGES_FAILED_MESSAGE) from e
 
     if success_count == 0:
-        raise ValueError(
-            "全ページの変換に失敗しました。PDFの内容や設定を確認してください。"
-        )
+        raise ValueError(ALL_PAGES_FAILED_MESSAGE)
 
     return zip_buffer.getvalue(), "application/zip", failed_pages, success_count
 
 
+CONVERTERS: dict[tuple[str, str], Callable[[str, str, bytes], tuple[bytes, str]]] = {
+    (source_ext, target_ext): converter
+    for targets, converter in (
+        (TABULAR_TARGETS, convert_tabular),
+        (TEXT_TARGETS, convert_text),
+        (IMAGE_TARGETS, convert_image),
+    )
+    for source_ext, candidates in targets.items()
+    for target_ext in candidates
+}
+
+
 def convert_file(
     source_ext: str,
     target_ext: str,
     raw: bytes,
     page_number: int = 1,
     dpi: int = 200,
+    fast_jpeg: bool = False,
 ) -> tuple[bytes, str]:
-    if source_ext in TABULAR_TARGETS:
-        return convert_tabular(source_ext, target_ext, raw)
-    if source_ext in TEXT_TARGETS:
-        return convert_text(source_ext, target_ext, raw)
-    if source_ext in IMAGE_TARGETS:
-        return convert_image(source_ext, target_ext, raw)
+    if is_same_format(source_ext, target_ext) and target_ext in MIME_TYPES:
+        return raw, MIME_TYPES[target_ext]
     if source_ext in PDF_TARGETS:
         return convert_pdf(
-            target_ext=target_ext, raw=raw, page_number=page_number, dpi=dpi
+            target_ext=target_ext,
+            raw=raw,
+            page_number=page_number,
+            dpi=dpi,
+            fast_jpeg=fast_jpeg,
         )
-    raise ValueError("この形式の変換は現在未対応です")
+    converter = CONVERTERS.get((source_ext, target_ext))
+    if converter is None:
+        raise ValueError("この形式の変換は現在未対応です")
+    return converter(source_ext, target_ext, raw)
 
 
 st.set_page_config(page_title="ファイル形式変換アプリ", page_icon="🔄")
@@ -248,6 +549,7 @@ if uploaded_file:
         page_number = 1
         dpi = 200
         pdf_mode = "single"
+        fast_jpeg = False
 
         if source_ext == "pdf":
             try:
@@ -276,6 +578,19 @@ if uploaded_file:
                     step=1,
                 )
             dpi = st.slider("画像解像度 (DPI)", min_value=72, max_value=300, value=200)
+            if pdf_mode == "single":
+                _prefetch_neighbor_pages(
+                    uploaded_file.file_id,
+                    raw_bytes,
+                    int(page_number) - 1,
+                    page_count,
+                    int(dpi),
+                )
+            if target_ext == "jpg":
+                fast_jpeg = st.checkbox(
+                    "高速モード (JPEG向け)",
+                    help=f"{FAST_JPEG_MIN_DPI} DPIを超える場合、縦横を半分に縮小してからJPEGに変換します",
+                )
 
         if st.button("変換する", type="primary"):
             try:
@@ -285,6 +600,7 @@ if uploaded_file:
                             target_ext=target_ext,
                             raw=raw_bytes,
                             dpi=int(dpi),
+                            fast_jpeg=fast_jpeg,
                         )
                     )
                     output_name = f"{Path(uploaded_file.name).stem}_all_pages.zip"
@@ -302,6 +618,7 @@ if uploaded_file:
                         raw_bytes,
                         page_number=int(page_number),
                         dpi=int(dpi),
+                        fast_jpeg=fast_jpeg,
                     )
                     output_name = f"{Path(uploaded_file.name).stem}.{target_ext}"
                     st.success("変換が完了しました。")